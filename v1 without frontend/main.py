@@ -60,11 +60,33 @@ Return JSON as a single JSON OBJECT, not an array or list. Do NOT output multipl
     return response.candidates[0].content.parts[0].text
 
 # === Pretty PDF Writer ===
+# fpdf has no process-global font registry, so the DejaVu TTF files get parsed
+# on every PrettyPDF() call. Cache the font tables built by the first instance
+# and hand them to later ones, paying the TTF parse only once per process.
+_FONT_CACHE = {}
+
+def _copy_fonts(fonts):
+    # shallow-copy each entry; the big char-width table is read-only and can be
+    # shared, but 'subset' is mutated per document and must stay per-instance
+    copied = {}
+    for key, font in fonts.items():
+        font = dict(font)
+        if 'subset' in font:
+            font['subset'] = list(font['subset'])
+        copied[key] = font
+    return copied
+
 class PrettyPDF(FPDF):
     def __init__(self):
         super().__init__()
-        self.add_font('DejaVu', '', 'fonts/DejaVuSans.ttf', uni=True)
-        self.add_font('DejaVu', 'B', 'fonts/DejaVuSans-Bold.ttf', uni=True)
+        if _FONT_CACHE:
+            self.fonts.update(_copy_fonts(_FONT_CACHE['fonts']))
+            self.font_files.update(dict(_FONT_CACHE['font_files']))
+        else:
+            self.add_font('DejaVu', '', 'fonts/DejaVuSans.ttf', uni=True)
+            self.add_font('DejaVu', 'B', 'fonts/DejaVuSans-Bold.ttf', uni=True)
+            _FONT_CACHE['fonts'] = _copy_fonts(self.fonts)
+            _FONT_CACHE['font_files'] = dict(self.font_files)
 
     def header(self):
         self.set_font("DejaVu", 'B', 16)